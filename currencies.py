@@ -1,8 +1,7 @@
 """Currency-related utilities for the EVM gas price monitor."""
 
 from typing import Dict, TypedDict, List
-import locale
-from locale import getlocale
+from functools import lru_cache
 
 class CurrencyInfo(TypedDict):
     """Type definition for currency information."""
@@ -65,45 +64,74 @@ LOCALE_CURRENCY_MAP = {
     # Add more mappings as needed
 }
 
-def get_locale_currency() -> str:
-    """Get the user's locale currency code, falling back to 'all' if not supported."""
+# Locale-independent (US) number formatting
+DEFAULT_FORMAT: Dict[str, str] = {
+    "decimal_point": ".",
+    "thousands_sep": ",",
+    "grouping": [3, 0]  # Group by 3 digits
+}
+
+@lru_cache(maxsize=1)
+def _get_localeconv() -> Dict:
+    """Apply the user's locale once and return its conventions, or {} if unavailable."""
+    import locale
+    
     try:
-        # Get the locale's currency code
         locale.setlocale(locale.LC_ALL, '')
-        currency_code = locale.localeconv()['int_curr_symbol'].strip()
-        
-        # Map to our supported currency or return 'all'
-        return LOCALE_CURRENCY_MAP.get(currency_code, "all")
-    except (locale.Error, KeyError):
-        return "all"
+        return locale.localeconv()
+    except locale.Error:
+        return {}
+
+@lru_cache(maxsize=1)
+def get_locale_currency() -> str:
+    """Get the user's locale currency code, falling back to 'all' if not supported."""
+    # Get the locale's currency code
+    currency_code = _get_localeconv().get('int_curr_symbol', '').strip()
+    
+    # Map to our supported currency or return 'all'
+    return LOCALE_CURRENCY_MAP.get(currency_code, "all")
 
+@lru_cache(maxsize=1)
 def get_locale_format() -> Dict[str, str]:
     """Get the locale's number formatting preferences."""
-    try:
-        locale.setlocale(locale.LC_ALL, '')
-        conv = locale.localeconv()
-        return {
-            "decimal_point": conv['decimal_point'],
-            "thousands_sep": conv['thousands_sep'],
-            "grouping": conv['grouping']
-        }
-    except locale.Error:
+    conv = _get_localeconv()
+    if not conv:
         # Fall back to US formatting
-        return {
-            "decimal_point": ".",
-            "thousands_sep": ",",
-            "grouping": [3, 0]  # Group by 3 digits
-        }
+        return DEFAULT_FORMAT
+    return {
+        "decimal_point": conv['decimal_point'],
+        "thousands_sep": conv['thousands_sep'],
+        "grouping": conv['grouping']
+    }
+
+def group_digits(int_part: str, sep: str, size: int) -> str:
+    """Insert a thousands separator between groups of digits in an integer string."""
+    sign, digits = ("-", int_part[1:]) if int_part.startswith("-") else ("", int_part)
+    if len(digits) <= size:
+        # Nothing to separate
+        return int_part
+    if size == 3 and digits.isdigit():
+        # Let the str.format machinery do the common 3-digit grouping in C
+        return sign + f"{int(digits):,}".replace(",", sep)
+    
+    # Reverse the integer part for easier grouping
+    int_part_rev = digits[::-1]
+    groups = []
+    for i in range(0, len(int_part_rev), size):
+        groups.append(int_part_rev[i:i + size])
+    # Join groups and reverse back
+    return sign + sep.join(groups)[::-1]
 
-def format_number(number: float, precision: int = 5) -> str:
+def format_number(number: float, precision: int = 5, locale_aware: bool = True) -> str:
     """Format a number according to the locale's preferences.
     
     For values less than 1, uses significant figures instead of fixed precision
     to avoid showing all zeros.
     For integers, shows no decimal places.
     For numbers greater than 1, uses 2 decimal places.
+    If locale_aware is False, uses DEFAULT_FORMAT without querying the locale.
     """
-    fmt = get_locale_format()
+    fmt = get_locale_format() if locale_aware else DEFAULT_FORMAT
     
     # Check if number is effectively an integer
     is_integer = abs(number - round(number)) < 1e-10
@@ -136,13 +164,7 @@ def format_number(number: float, precision: int = 5) -> str:
     
     # Add thousands separators
     if fmt["grouping"]:
-        # Reverse the integer part for easier grouping
-        int_part_rev = int_part[::-1]
-        groups = []
-        for i in range(0, len(int_part_rev), fmt["grouping"][0]):
-            groups.append(int_part_rev[i:i + fmt["grouping"][0]])
-        # Join groups and reverse back
-        int_part = fmt["thousands_sep"].join(groups)[::-1]
+        int_part = group_digits(int_part, fmt["thousands_sep"], fmt["grouping"][0])
     
     # Combine parts
     if dec_part:
@@ -155,11 +177,13 @@ def normalize_currency(currency: str) -> str:
         return "all"
     return currency.upper()
 
+@lru_cache(maxsize=None)
 def get_currency_symbol(currency: str) -> str:
     """Get the symbol for a currency."""
     normalized = normalize_currency(currency)
     return SUPPORTED_CURRENCIES.get(normalized, {}).get("symbol", normalized)
 
+@lru_cache(maxsize=None)
 def get_currency_name(currency: str) -> str:
     """Get the friendly name for a currency."""
     normalized = normalize_currency(currency)
@@ -1,14 +1,30 @@
 """Core utilities for the EVM gas price monitor."""
 
-from web3 import Web3
 import asyncio
-import aiohttp
+import atexit
+import random
 from datetime import datetime
 import time
-from typing import Dict, Union, List
-from decimal import Decimal, ROUND_DOWN
+from typing import TYPE_CHECKING, Any, Dict, Union, List, Optional, Set, Awaitable, TypeVar
+from math import floor
+import json
+import threading
+from urllib.parse import urlparse
 
-from networks import RPC_ENDPOINTS, get_network_info
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# aiohttp is slow to import, so it is imported where it is used to keep CLI
+# startup (e.g. --help) fast
+if TYPE_CHECKING:
+    import aiohttp
+
+from networks import (
+    RPC_ENDPOINTS, TOKEN_MAP, get_network_info, rank_endpoints,
+    record_endpoint_stats, record_endpoint_miss
+)
 from currencies import (
     SUPPORTED_CURRENCIES,
     get_currency_symbol, get_currency_name, get_all_currencies,
@@ -16,98 +32,537 @@ from currencies import (
 )
 
 DEFAULT_GAS_UNITS = 1_000_000  # 1 million gas units
+WEI_PER_GWEI = 10**9
+WEI_PER_ETH = 10**18
+RPC_TIMEOUT = 10  # seconds
+RPC_CONNECT_TIMEOUT = 3  # seconds to establish a connection, retried on expiry
+RPC_MAX_TRIES = 3  # attempts per endpoint for transient errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+HOST_CONCURRENCY = 4  # in-flight requests per RPC host
+RACE_WIDTH = 2  # endpoints queried concurrently per network
+
+# Static per-network info, resolved once at import
+_NETWORK_INFO = {network: get_network_info(network) for network in RPC_ENDPOINTS}
+
+# Circuit breaker state per RPC endpoint: {"fail_count": int, "opened_at": monotonic}
+BREAKER_MAX_COOLDOWN = 60.0  # seconds
+_BREAKER: Dict[str, Dict[str, float]] = {}
+
+# Endpoints that rejected a JSON-RPC batch and get separate calls instead
+_NO_BATCH_ENDPOINTS: Set[str] = set()
+
+# Per-host request limits so bursts don't trip public providers' rate limits:
+# {(event loop, netloc): semaphore}
+_HOST_SEMAPHORES: Dict[tuple, asyncio.Semaphore] = {}
+
+# Shared aiohttp sessions, one per event loop, created lazily: {loop: session}
+_SESSIONS: Dict[asyncio.AbstractEventLoop, "aiohttp.ClientSession"] = {}
+# Tasks that close the session when a caller-managed loop shuts down: {loop: task}
+_SESSION_CLOSERS: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}
+
+# Event loop kept open across calls to the sync wrappers on the main thread, so
+# the shared session and its pooled connections survive between calls
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+COINGECKO_URL = "https://api.coingecko.com/api/v3/simple/price"
+
+# CoinGecko responses keyed by (ids, vs_currencies): (fetched_at monotonic, data)
+_PRICE_TTL = 45.0  # seconds
+_PRICE_CACHE: Dict[tuple, tuple] = {}
+_PRICE_INFLIGHT: Dict[tuple, asyncio.Task] = {}
+
+# Latest fee data per network, kept for about one block:
+# (expires_at monotonic, endpoint, fee_history, block_number, timestamps of the fetch)
+_FEE_CACHE: Dict[str, tuple] = {}
+
+# Gas price results keyed by (gas_units, networks): (fetched_at monotonic, results)
+_GAS_TTL = 5.0  # seconds
+_GAS_CACHE: Dict[tuple, tuple] = {}
+_GAS_INFLIGHT: Dict[tuple, asyncio.Task] = {}
+
+# Last result of get_current_timestamps: (unix second, timestamps)
+_TS_CACHE: Optional[tuple] = None
+
+T = TypeVar("T")
+
+def _json_dumps(obj: Any) -> str:
+    """Serialize request bodies, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 def wei_to_eth(wei: int) -> float:
     """Convert wei to ETH."""
-    return wei / 10**18
+    return wei / WEI_PER_ETH
+
+async def _get_session() -> "aiohttp.ClientSession":
+    """Get the shared aiohttp session for the running event loop, creating it if needed.
+
+    A session is tied to the event loop it was created on, so each loop gets
+    its own. Sessions on loops not managed by _run() are closed when the loop
+    shuts down its tasks (as asyncio.run() does); callers managing their loop
+    by hand should await close_session() before closing it.
+    """
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    session = _SESSIONS.get(loop)
+    if session is None or session.closed:
+        # Forget sessions of loops that were closed without shutting down tasks;
+        # they can no longer be closed cleanly
+        for other in [other for other in list(_SESSIONS) if other.is_closed()]:
+            stale = _SESSIONS.pop(other, None)
+            if stale is not None:
+                stale.detach()
+            _SESSION_CLOSERS.pop(other, None)
+        
+        session = aiohttp.ClientSession(
+            # Keep connections and DNS lookups around between polls, while capping
+            # how many connections we open to any single RPC provider
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+            json_serialize=_json_dumps
+        )
+        _SESSIONS[loop] = session
+        if loop is not _LOOP and loop not in _SESSION_CLOSERS:
+            _SESSION_CLOSERS[loop] = loop.create_task(_close_session_on_shutdown())
+    return session
+
+async def _close_session_on_shutdown() -> None:
+    """Wait until cancelled, then close the loop's session; asyncio.run() cancels leftover tasks on exit."""
+    try:
+        await asyncio.get_running_loop().create_future()
+    finally:
+        await close_session()
+
+async def close_session() -> None:
+    """Close the running loop's shared aiohttp session if it is open."""
+    loop = asyncio.get_running_loop()
+    for key in [key for key in list(_HOST_SEMAPHORES) if key[0] is loop]:
+        _HOST_SEMAPHORES.pop(key, None)
+    closer = _SESSION_CLOSERS.pop(loop, None)
+    if closer is not None and closer is not asyncio.current_task():
+        closer.cancel()
+    session = _SESSIONS.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
+
+def _get_or_create_loop() -> asyncio.AbstractEventLoop:
+    """Get the main thread's long-lived event loop used by the sync wrappers, creating it if needed."""
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed():
+        _LOOP = asyncio.new_event_loop()
+    return _LOOP
+
+def _run(coro: Awaitable[T]) -> T:
+    """Run a coroutine to completion for the sync wrappers.
+
+    On the main thread this uses a long-lived event loop: unlike asyncio.run(),
+    the loop and its shared session stay open between calls, so repeated calls
+    reuse pooled connections. Call close_all() to release them early; it also
+    runs on interpreter exit. Other threads may be short-lived and can't be
+    relied on to clean up after themselves, so they use asyncio.run(), which
+    closes the loop and its session before returning.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return asyncio.run(coro)
+    return _get_or_create_loop().run_until_complete(coro)
+
+@atexit.register
+def close_all() -> None:
+    """Close the main thread's long-lived event loop and its shared session.
+
+    Only the main thread owns that loop, so calls from other threads do nothing.
+    """
+    global _LOOP
+    loop = _LOOP
+    if (threading.current_thread() is not threading.main_thread()
+            or loop is None or loop.is_closed() or loop.is_running()):
+        return
+    try:
+        loop.run_until_complete(close_session())
+        # Let cancelled or leftover tasks (e.g. race losers) finish unwinding
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+        _LOOP = None
+
+class RPCError(Exception):
+    """Raised when a JSON-RPC endpoint returns an error response."""
+
+class BatchUnsupportedError(RPCError):
+    """Raised when an endpoint rejects or mangles a JSON-RPC batch request."""
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether a request error is transient and worth retrying.
+
+    Only connection-level failures are retried. A request that times out after
+    connecting has already used up the RPC_TIMEOUT budget, so it is not.
+    """
+    import aiohttp
+    
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    # ConnectionTimeoutError was added in aiohttp 3.10; older versions can't
+    # tell connect timeouts apart from read timeouts, so neither is retried
+    connect_timeout = getattr(aiohttp, "ConnectionTimeoutError", ())
+    return isinstance(error, (aiohttp.ClientOSError, connect_timeout))
+
+def _describe_error(error: BaseException) -> str:
+    """Describe an exception for error messages, even if it has no message (e.g. timeouts)."""
+    return str(error) or type(error).__name__
+
+def _host_semaphore(endpoint: str) -> asyncio.Semaphore:
+    """Get the semaphore limiting concurrent requests to an endpoint's host.
+
+    Semaphores are bound to the event loop they are used on, so each loop
+    (e.g. one per thread) gets its own set.
+    """
+    key = (asyncio.get_running_loop(), urlparse(endpoint).netloc)
+    semaphore = _HOST_SEMAPHORES.get(key)
+    if semaphore is None:
+        # Drop semaphores left behind by loops that have since been closed
+        for stale in [stale for stale in list(_HOST_SEMAPHORES) if stale[0].is_closed()]:
+            _HOST_SEMAPHORES.pop(stale, None)
+        semaphore = _HOST_SEMAPHORES[key] = asyncio.Semaphore(HOST_CONCURRENCY)
+    return semaphore
+
+async def _post_json(session: "aiohttp.ClientSession", endpoint: str, payload: Any) -> Any:
+    """POST a JSON-RPC payload and return the decoded response.
+
+    Connection errors, connect timeouts and HTTP 429/5xx responses are retried
+    up to RPC_MAX_TRIES times with full-jitter exponential backoff, all within
+    a single RPC_TIMEOUT budget counted from the first attempt. Other HTTP
+    errors, read timeouts and malformed responses fail immediately. At most
+    HOST_CONCURRENCY requests per host are in flight at once; backoff sleeps
+    don't hold a slot.
+    """
+    import aiohttp
+    
+    semaphore = _host_semaphore(endpoint)
+    deadline = time.monotonic() + RPC_TIMEOUT
+    for attempt in range(RPC_MAX_TRIES):
+        try:
+            async with semaphore:
+                # Each attempt only gets what is left of the overall budget
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                timeout = aiohttp.ClientTimeout(
+                    total=remaining, sock_connect=min(RPC_CONNECT_TIMEOUT, remaining)
+                )
+                async with session.post(endpoint, json=payload, timeout=timeout) as response:
+                    response.raise_for_status()
+                    return await response.json(loads=_json_loads, content_type=None)
+        except Exception as e:
+            delay = random.uniform(0, min(1.0, 0.1 * 2 ** attempt))
+            if (attempt == RPC_MAX_TRIES - 1 or not _is_retryable(e)
+                    or time.monotonic() + delay >= deadline):
+                raise
+        await asyncio.sleep(delay)
+
+async def rpc_call(session: "aiohttp.ClientSession", endpoint: str, method: str, params: list) -> Any:
+    """Make a single JSON-RPC call and return its result."""
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+    data = await _post_json(session, endpoint, payload)
+    
+    if "error" in data:
+        raise RPCError(f"{method}: {data['error']}")
+    return data["result"]
+
+async def rpc_batch(session: "aiohttp.ClientSession", endpoint: str, calls: List[tuple]) -> List[Any]:
+    """Make several JSON-RPC calls in one batched request and return their results in order."""
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls, start=1)
+    ]
+    data = await _post_json(session, endpoint, payload)
+    
+    if not isinstance(data, list):
+        error = data.get("error", data) if isinstance(data, dict) else data
+        raise BatchUnsupportedError(f"Batch request rejected: {error}")
+    
+    # Responses may arrive in any order, so match them up by id
+    responses = {item.get("id"): item for item in data}
+    results = []
+    for i, (method, _) in enumerate(calls, start=1):
+        item = responses.get(i)
+        if item is None:
+            raise BatchUnsupportedError(f"{method}: missing from batch response")
+        if "error" in item:
+            raise RPCError(f"{method}: {item['error']}")
+        results.append(item["result"])
+    return results
+
+def _parse_fee_data(fee_history: Dict, block_number: str) -> tuple:
+    """Decode the hex quantities in an eth_feeHistory result and block number."""
+    return {
+        "baseFeePerGas": [int(fee, 16) for fee in fee_history["baseFeePerGas"]],
+        "reward": [[int(fee, 16) for fee in rewards] for rewards in fee_history["reward"]]
+    }, int(block_number, 16)
+
+async def fetch_fee_history_and_block_number(session: "aiohttp.ClientSession", endpoint: str) -> tuple:
+    """Fetch fee history and the latest block number from an endpoint.
+
+    Both calls are sent as a single JSON-RPC batch, falling back to separate
+    concurrent calls if the batch fails. Endpoints that reject batches (with an
+    HTTP 4xx or a malformed batch response) are remembered and get separate
+    calls from then on.
+    """
+    import aiohttp
+    
+    calls = [
+        ("eth_feeHistory", [hex(5), "latest", [10, 50, 90]]),
+        ("eth_blockNumber", [])
+    ]
+    if endpoint not in _NO_BATCH_ENDPOINTS:
+        try:
+            fee_history, block_number = await rpc_batch(session, endpoint, calls)
+        except BatchUnsupportedError:
+            _NO_BATCH_ENDPOINTS.add(endpoint)
+        except aiohttp.ClientResponseError as e:
+            # 429 means rate limiting rather than an unsupported request
+            if not 400 <= e.status < 500 or e.status == 429:
+                raise
+            _NO_BATCH_ENDPOINTS.add(endpoint)
+        except RPCError:
+            pass  # One of the calls failed; try them separately this time
+        else:
+            return _parse_fee_data(fee_history, block_number)
+    
+    fee_history, block_number = await asyncio.gather(
+        *(rpc_call(session, endpoint, method, params) for method, params in calls)
+    )
+    return _parse_fee_data(fee_history, block_number)
+
+# Largest value whose 8-decimal scaling stays exact in a float (2**53 / 1e8)
+_TRUNCATE_8_EXACT_LIMIT = 2 ** 53 / 1e8
+
+def truncate_8(value: float) -> float:
+    """Truncate a value to 8 decimal places, matching Decimal's ROUND_DOWN on str(value).
+
+    The scaled value is nudged by one step when float rounding in value * 1e8
+    lands on the wrong side (e.g. 67.1 * 1e8 == 6709999999.999999). That is
+    only exact while value * 1e8 fits in a float's 53-bit mantissa (values
+    below about 9e7), so larger values go through Decimal instead.
+    Negative values are truncated toward zero, like ROUND_DOWN.
+    """
+    if value < 0:
+        return -truncate_8(-value)
+    if value >= _TRUNCATE_8_EXACT_LIMIT:
+        from decimal import Decimal, ROUND_DOWN
+        return float(Decimal(str(value)).quantize(Decimal("1e-8"), rounding=ROUND_DOWN))
+    scaled = floor(value * 1e8)
+    if scaled / 1e8 > value:
+        scaled -= 1
+    elif (scaled + 1) / 1e8 <= value:
+        scaled += 1
+    return scaled / 1e8
 
 def get_current_timestamps() -> Dict[str, Union[int, str]]:
-    """Get current Unix timestamp and formatted datetime with timezone."""
-    now = datetime.now().astimezone()  # Makes it timezone-aware using the local time zone
+    """Get current Unix timestamp and formatted datetime with timezone.
+
+    The formatted datetime is reused for calls within the same second.
+    """
+    global _TS_CACHE
+    now = int(time.time())
+    if _TS_CACHE is None or _TS_CACHE[0] != now:
+        # Makes it timezone-aware using the local time zone
+        local = datetime.fromtimestamp(now).astimezone()
+        _TS_CACHE = (now, {
+            "timestamp": now,
+            "datetime": local.strftime("%Y-%m-%d %H:%M:%S %Z")
+        })
+    return dict(_TS_CACHE[1])
+
+def _breaker_open(endpoint: str, now: float) -> bool:
+    """Check whether an endpoint failed recently and is still cooling down."""
+    state = _BREAKER.get(endpoint)
+    if state is None:
+        return False
+    cooldown = min(BREAKER_MAX_COOLDOWN, 2 ** state["fail_count"])
+    return now - state["opened_at"] < cooldown
+
+def _record_endpoint_result(endpoint: str, success: bool, latency_ms: Optional[float] = None) -> None:
+    """Update an endpoint's health stats and circuit breaker after a request.
+
+    The breaker is reset on success, or opened for longer on each failure.
+    """
+    record_endpoint_stats(endpoint, success, latency_ms)
+    if success:
+        _BREAKER.pop(endpoint, None)
+        return
+    state = _BREAKER.setdefault(endpoint, {"fail_count": 0, "opened_at": 0.0})
+    state["fail_count"] += 1
+    state["opened_at"] = time.monotonic()
+
+def order_endpoints(endpoints: List[str]) -> List[str]:
+    """Order endpoints by observed health, with open circuit breakers tried last.
+
+    Once an endpoint's cooldown expires it moves back into the normal order and
+    gets a trial request (half-open); failing again doubles its cooldown.
+    """
+    endpoints = rank_endpoints(endpoints)
+    now = time.monotonic()
+    healthy = [ep for ep in endpoints if not _breaker_open(ep, now)]
+    tripped = [ep for ep in endpoints if _breaker_open(ep, now)]
+    return healthy + tripped
+
+def _build_network_result(network: str, endpoint: str, fee_history: Dict, block_number: int,
+                          gas_units: int, timestamps: Dict[str, Union[int, str]]) -> Dict:
+    """Turn fee history for a network into gas prices and native token costs."""
+    # Calculate gas prices for each percentile
+    gas_prices_gwei = {}
+    native_token_costs = {}
+    
+    for i, percentile in enumerate([10, 50, 90]):
+        # Calculate total gas price (base fee + priority fee)
+        base_fee = fee_history['baseFeePerGas'][-1]  # Use the latest base fee
+        priority_fee = fee_history['reward'][-1][i]  # Get priority fee for this percentile
+        total_gas_price = base_fee + priority_fee
+        
+        # Convert to gwei and calculate costs (int / int division is correctly rounded)
+        gas_price_gwei = total_gas_price / WEI_PER_GWEI
+        native_token_cost = total_gas_price * gas_units / WEI_PER_ETH
+        
+        gas_prices_gwei[str(percentile)] = gas_price_gwei
+        native_token_costs[str(percentile)] = native_token_cost
+    
+    network_info = _NETWORK_INFO[network]
+    
     return {
-        "timestamp": int(time.time()),
-        "datetime": now.strftime("%Y-%m-%d %H:%M:%S %Z")
+        "gas_prices_gwei": gas_prices_gwei,
+        "native_token_costs": native_token_costs,
+        "native_token": network_info["native_token"],
+        "native_token_symbol": network_info["native_token_symbol"],
+        "gas_units": gas_units,
+        "block_number": block_number,
+        "timestamp": timestamps["timestamp"],
+        "datetime": timestamps["datetime"],
+        "rpc_url": endpoint
     }
 
-async def fetch_network_data(network: str, gas_units: int, timestamps: Dict[str, Union[int, str]]) -> Dict:
-    """Fetch data for a single network, retrying with different endpoints if one fails."""
-    endpoints = RPC_ENDPOINTS[network]
+async def _fetch_from_endpoint(session: "aiohttp.ClientSession", network: str, endpoint: str,
+                               gas_units: int, timestamps: Dict[str, Union[int, str]]) -> Dict:
+    """Fetch gas data for a network from one endpoint, raising on failure."""
+    # Get fee history with percentiles and the latest block number
+    fee_history, block_number = await fetch_fee_history_and_block_number(session, endpoint)
+    
+    # Successive calls within the same block would return the same data
+    expires_at = time.monotonic() + _NETWORK_INFO[network]["block_time"]
+    _FEE_CACHE[network] = (expires_at, endpoint, fee_history, block_number, timestamps)
+    
+    return _build_network_result(network, endpoint, fee_history, block_number, gas_units, timestamps)
+
+async def fetch_network_data(network: str, gas_units: int, timestamps: Dict[str, Union[int, str]],
+                             session: Optional["aiohttp.ClientSession"] = None) -> Dict:
+    """Fetch data for a single network, racing endpoints and falling back if one fails.
+
+    Up to RACE_WIDTH endpoints are queried at once and the first successful
+    reply wins; each failure starts the next endpoint in line. Endpoints with an
+    open circuit breaker are only started when nothing else is in flight.
+    """
+    # Reuse fee data fetched within the network's current block, keeping the
+    # timestamps of when it was fetched
+    cached = _FEE_CACHE.get(network)
+    if cached is not None and time.monotonic() < cached[0]:
+        _, endpoint, fee_history, block_number, fetched_at = cached
+        return _build_network_result(network, endpoint, fee_history, block_number, gas_units, fetched_at)
+    
+    queue = order_endpoints(RPC_ENDPOINTS[network])
     errors = []
+    if session is None:
+        session = await _get_session()
     
-    # Try each endpoint until one succeeds
-    for endpoint in endpoints:
-        try:
-            w3 = Web3(Web3.HTTPProvider(endpoint))
-            
-            # Get fee history with percentiles
-            fee_history = w3.eth.fee_history(
-                block_count=5,
-                newest_block='latest',
-                reward_percentiles=[10, 50, 90]
-            )
-            
-            # Calculate gas prices for each percentile
-            gas_prices_gwei = {}
-            native_token_costs = {}
-            
-            for i, percentile in enumerate([10, 50, 90]):
-                # Calculate total gas price (base fee + priority fee)
-                base_fee = fee_history['baseFeePerGas'][-1]  # Use the latest base fee
-                priority_fee = fee_history['reward'][-1][i]  # Get priority fee for this percentile
-                total_gas_price = base_fee + priority_fee
-                
-                # Convert to gwei and calculate costs
-                gas_price_gwei = float(Web3.from_wei(total_gas_price, 'gwei'))
-                total_cost_wei = total_gas_price * gas_units
-                native_token_cost = wei_to_eth(total_cost_wei)
-                
-                gas_prices_gwei[str(percentile)] = gas_price_gwei
-                native_token_costs[str(percentile)] = native_token_cost
-            
-            block_number = w3.eth.block_number
-            network_info = get_network_info(network)
-            
-            return {
-                "gas_prices_gwei": gas_prices_gwei,
-                "native_token_costs": native_token_costs,
-                "native_token": network_info["native_token"],
-                "native_token_symbol": network_info["native_token_symbol"],
-                "gas_units": gas_units,
-                "block_number": block_number,
-                "timestamp": timestamps["timestamp"],
-                "datetime": timestamps["datetime"],
-                "rpc_url": endpoint
-            }
-        except Exception as e:
-            errors.append(f"{endpoint}: {str(e)}")
-            continue
+    pending = {}
+    
+    def start_more() -> None:
+        now = time.monotonic()
+        while queue and len(pending) < RACE_WIDTH and (not pending or not _breaker_open(queue[0], now)):
+            endpoint = queue.pop(0)
+            task = asyncio.ensure_future(_fetch_from_endpoint(session, network, endpoint, gas_units, timestamps))
+            pending[task] = (endpoint, time.monotonic())
+    
+    start_more()
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                endpoint, started = pending.pop(task)
+                if task.exception() is None:
+                    latency_ms = (time.monotonic() - started) * 1000
+                    _record_endpoint_result(endpoint, success=True, latency_ms=latency_ms)
+                    return task.result()
+                _record_endpoint_result(endpoint, success=False)
+                errors.append(f"{endpoint}: {_describe_error(task.exception())}")
+            start_more()
+    finally:
+        # Cancel the slower endpoints once one has answered and count it as a miss
+        now = time.monotonic()
+        for task, (endpoint, started) in pending.items():
+            task.cancel()
+            record_endpoint_miss(endpoint, (now - started) * 1000)
     
     # If all endpoints failed, return error with details
     return {"error": f"All endpoints failed: {'; '.join(errors)}"}
 
-async def get_gas_prices_async(gas_units: float = 1.0) -> Dict[str, Dict[str, Union[float, int, str]]]:
-    """Get gas prices for all networks asynchronously."""
-    actual_gas_units = int(gas_units * DEFAULT_GAS_UNITS)
+async def _fetch_gas_prices(gas_units: int, networks: tuple,
+                            session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
+    """Fetch gas prices for the given networks concurrently and cache the results."""
     timestamps = get_current_timestamps()
     
     # Create tasks for all networks
     tasks = [
-        fetch_network_data(network, actual_gas_units, timestamps)
-        for network in RPC_ENDPOINTS.keys()
+        fetch_network_data(network, gas_units, timestamps, session)
+        for network in networks
     ]
     
     # Wait for all tasks to complete
     results = await asyncio.gather(*tasks)
     
     # Combine results with network names
-    return dict(zip(RPC_ENDPOINTS.keys(), results))
+    results = dict(zip(networks, results))
+    _GAS_CACHE[(gas_units, networks)] = (time.monotonic(), results)
+    return results
+
+async def get_gas_prices_async(gas_units: float = 1.0,
+                               session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
+    """Get gas prices for all networks asynchronously.
+
+    Pass `session` to use a caller-managed aiohttp session instead of the
+    shared one, e.g. to keep connections alive across calls.
+    """
+    actual_gas_units = int(gas_units * DEFAULT_GAS_UNITS)
+    networks = tuple(RPC_ENDPOINTS.keys())
+    key = (actual_gas_units, networks)
+    
+    # Serve from cache while fresh
+    cached = _GAS_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _GAS_TTL:
+        return dict(cached[1])
+    
+    # Coalesce concurrent calls for the same query into one fan-out
+    task = _GAS_INFLIGHT.get(key)
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_gas_prices(actual_gas_units, networks, session))
+        _GAS_INFLIGHT[key] = task
+    
+    return dict(await asyncio.shield(task))
 
 def get_gas_prices(gas_units: float = 1.0) -> Dict[str, Dict[str, Union[float, int, str]]]:
     """Get gas prices for all networks."""
-    return asyncio.run(get_gas_prices_async(gas_units))
+    return _run(get_gas_prices_async(gas_units))
 
-async def get_crypto_prices_async(currencies: List[str] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
-    """Get cryptocurrency prices from CoinGecko asynchronously."""
+def _coingecko_params(currencies: List[str] = None) -> Dict[str, str]:
+    """Build the CoinGecko query parameters for a list of currencies."""
     if currencies is None:
         currencies = [get_locale_currency()]
     elif "all" in currencies:
@@ -116,33 +571,82 @@ async def get_crypto_prices_async(currencies: List[str] = None) -> Dict[str, Dic
     # Convert currencies to lowercase for API call
     api_currencies = [c.lower() for c in currencies]
     
-    url = "https://api.coingecko.com/api/v3/simple/price"
-    params = {
+    return {
         "ids": "ethereum,fantom,polygon-ecosystem-token,xdai,avalanche-2,shardeum,binancecoin,optimism,base",
         "vs_currencies": ",".join(api_currencies)
     }
+
+async def _fetch_crypto_prices(params: Dict[str, str],
+                               session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
+    """Fetch prices from CoinGecko, adding request timestamps and caching the result."""
+    if session is None:
+        session = await _get_session()
+    async with session.get(COINGECKO_URL, params=params) as response:
+        response.raise_for_status()
+        data = _json_loads(await response.read())
+        
+        # Add timestamps
+        timestamps = get_current_timestamps()
+        data['timestamp'] = timestamps["timestamp"]
+        data['datetime'] = timestamps["datetime"]
+    
+    _PRICE_CACHE[(params["ids"], params["vs_currencies"])] = (time.monotonic(), data)
+    return data
+
+async def get_crypto_prices_async(currencies: List[str] = None,
+                                  session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
+    """Get cryptocurrency prices from CoinGecko asynchronously.
+
+    Pass `session` to use a caller-managed aiohttp session instead of the
+    shared one.
+    """
+    params = _coingecko_params(currencies)
+    key = (params["ids"], params["vs_currencies"])
+    
+    # Serve from cache while fresh
+    cached = _PRICE_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < _PRICE_TTL:
+        return dict(cached[1])
+    
+    # Coalesce concurrent misses for the same query into one request
+    task = _PRICE_INFLIGHT.get(key)
+    if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch_crypto_prices(params, session))
+        _PRICE_INFLIGHT[key] = task
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                response.raise_for_status()
-                data = await response.json()
-                
-                # Add timestamps
-                timestamps = get_current_timestamps()
-                data['timestamp'] = timestamps["timestamp"]
-                data['datetime'] = timestamps["datetime"]
-                
-                return data
+        data = await asyncio.shield(task)
     except Exception as e:
-        return {"error": str(e)}
+        return {"error": _describe_error(e)}
+    
+    return dict(data)
+
+async def refresh_crypto_prices(currencies: List[str] = None, interval: float = 30.0) -> None:
+    """Keep the CoinGecko price cache warm by refetching every `interval` seconds.
+
+    Meant for long-running callers: run it with asyncio.create_task() and
+    get_crypto_prices_async will be served from memory without waiting on
+    CoinGecko. The interval should stay below the cache TTL.
+    """
+    params = _coingecko_params(currencies)
+    while True:
+        try:
+            await _fetch_crypto_prices(params)
+        except Exception:
+            pass  # Keep the last good prices; try again next interval
+        await asyncio.sleep(interval)
 
 def get_crypto_prices(currencies: List[str] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
     """Get cryptocurrency prices."""
-    return asyncio.run(get_crypto_prices_async(currencies))
+    return _run(get_crypto_prices_async(currencies))
+
+async def calculate_gas_costs_async(gas_units: float = 1.0, currencies: List[str] = None,
+                                    session: Optional["aiohttp.ClientSession"] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
+    """Calculate gas costs in specified currencies for all networks asynchronously.
 
-async def calculate_gas_costs_async(gas_units: float = 1.0, currencies: List[str] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
-    """Calculate gas costs in specified currencies for all networks asynchronously."""
+    Pass `session` to run both the RPC and CoinGecko requests on a
+    caller-managed aiohttp session instead of the shared one.
+    """
     if currencies is None:
         currencies = [get_locale_currency()]
     elif "all" in currencies:
@@ -152,8 +656,8 @@ async def calculate_gas_costs_async(gas_units: float = 1.0, currencies: List[str
     currencies = [normalize_currency(c) for c in currencies]
     
     # Fetch gas prices and crypto prices concurrently
-    gas_prices_task = get_gas_prices_async(gas_units)
-    crypto_prices_task = get_crypto_prices_async(currencies)
+    gas_prices_task = get_gas_prices_async(gas_units, session)
+    crypto_prices_task = get_crypto_prices_async(currencies, session)
     
     gas_prices, crypto_prices = await asyncio.gather(gas_prices_task, crypto_prices_task)
     
@@ -166,30 +670,27 @@ async def calculate_gas_costs_async(gas_units: float = 1.0, currencies: List[str
             results[network] = {"error": gas_data["error"]}
             continue
             
-        network_info = get_network_info(network)
-        token = network_info["coingecko_id"]
+        token = TOKEN_MAP.get(network)
         
         # Calculate costs in each currency for each percentile
         costs = {}
         token_prices = {}
+        token_data = crypto_prices.get(token, {})
+        native_token_costs = gas_data["native_token_costs"]
         for currency in currencies:
             # Use lowercase for API data lookup
-            token_data = crypto_prices.get(token, {})
-            if not token_data or currency.lower() not in token_data:
+            token_price = token_data.get(currency.lower())
+            if token_price is None:
                 # Skip this currency/token combination if price data is unavailable
                 continue
 
-            token_price = token_data[currency.lower()]
-            token_price_decimal = Decimal(str(token_price)).quantize(Decimal('0.00000001'), rounding=ROUND_DOWN)
-            token_prices[currency] = float(token_price_decimal)
+            token_prices[currency] = truncate_8(token_price)
 
             # Calculate costs for each percentile
-            costs[currency] = {}
-            for percentile in ["10", "50", "90"]:
-                native_token_cost = gas_data["native_token_costs"][percentile]
-                cost = native_token_cost * token_price
-                cost_decimal = Decimal(str(cost)).quantize(Decimal('0.00000001'), rounding=ROUND_DOWN)
-                costs[currency][percentile] = float(cost_decimal)
+            costs[currency] = {
+                percentile: truncate_8(native_token_costs[percentile] * token_price)
+                for percentile in ("10", "50", "90")
+            }
         
         results[network] = {
             "gas_prices_gwei": gas_data["gas_prices_gwei"],
@@ -209,4 +710,4 @@ async def calculate_gas_costs_async(gas_units: float = 1.0, currencies: List[str
 
 def calculate_gas_costs(gas_units: float = 1.0, currencies: List[str] = None) -> Dict[str, Dict[str, Union[float, int, str]]]:
     """Calculate gas costs in specified currencies for all networks."""
-    return asyncio.run(calculate_gas_costs_async(gas_units, currencies)) 
\ No newline at end of file
+    return _run(calculate_gas_costs_async(gas_units, currencies)) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Network-related utilities for the EVM gas price monitor."""
 
-from typing import Dict, List, TypedDict
+from typing import Dict, List, Optional, TypedDict
+from functools import lru_cache
 import random
 
 class NetworkInfo(TypedDict):
@@ -9,6 +10,7 @@ class NetworkInfo(TypedDict):
     native_token: str
     native_token_symbol: str
     coingecko_id: str
+    block_time: float  # Approximate seconds between blocks
 
 # Define network information
 NETWORKS: Dict[str, NetworkInfo] = {
@@ -16,67 +18,78 @@ NETWORKS: Dict[str, NetworkInfo] = {
         "name": "Ethereum",
         "native_token": "Ether",
         "native_token_symbol": "ETH",
-        "coingecko_id": "ethereum"
+        "coingecko_id": "ethereum",
+        "block_time": 12.0
     },
     "Arbitrum One": {
         "name": "Arbitrum",
         "native_token": "Ether",
         "native_token_symbol": "ETH",
-        "coingecko_id": "ethereum"
+        "coingecko_id": "ethereum",
+        "block_time": 0.25
     },
     "Optimism": {
         "name": "Optimism",
         "native_token": "Ether",
         "native_token_symbol": "ETH",
-        "coingecko_id": "ethereum"
+        "coingecko_id": "ethereum",
+        "block_time": 2.0
     },
     "Base": {
         "name": "Base",
         "native_token": "Ether",
         "native_token_symbol": "ETH",
-        "coingecko_id": "ethereum"
+        "coingecko_id": "ethereum",
+        "block_time": 2.0
     },
     "Gnosis": {
         "name": "Gnosis",
         "native_token": "xDai",
         "native_token_symbol": "xDAI",
-        "coingecko_id": "xdai"
+        "coingecko_id": "xdai",
+        "block_time": 5.0
     },
     "Polygon": {
         "name": "Polygon",
         "native_token": "Polygon",
         "native_token_symbol": "POL",
-        "coingecko_id": "polygon-ecosystem-token"
+        "coingecko_id": "polygon-ecosystem-token",
+        "block_time": 2.0
     },
     "Avalanche": {
         "name": "Avalanche",
         "native_token": "Avalanche",
         "native_token_symbol": "AVAX",
-        "coingecko_id": "avalanche-2"
+        "coingecko_id": "avalanche-2",
+        "block_time": 2.0
     },
     "BSC": {
         "name": "Binance Smart Chain",
         "native_token": "Binance Coin",
         "native_token_symbol": "BNB",
-        "coingecko_id": "binancecoin"
+        "coingecko_id": "binancecoin",
+        "block_time": 3.0
     },
     "Fantom": {
         "name": "Fantom",
         "native_token": "Fantom",
         "native_token_symbol": "FTM",
-        "coingecko_id": "fantom"
+        "coingecko_id": "fantom",
+        "block_time": 1.0
     },
     "Linea": {
         "name": "Linea",
         "native_token": "Ether",
         "native_token_symbol": "ETH",
-        "coingecko_id": "ethereum"
+        "coingecko_id": "ethereum",
+        "block_time": 2.0
     },
     "Shardeum Mainnet": {
         "name": "Shardeum",
         "native_token": "Shardeum",
         "native_token_symbol": "SHM",
-        "coingecko_id": "shardeum"
+        "coingecko_id": "shardeum",
+        "block_time": 6.0
     },
 }
 
@@ -140,23 +153,100 @@ RPC_ENDPOINTS: Dict[str, List[str]] = {
 # Track last used endpoint for each network
 last_used_endpoints = {network: None for network in RPC_ENDPOINTS.keys()}
 
-# Map networks to their native tokens
-TOKEN_MAP = {
-    "Ethereum Mainnet": "ethereum",
-    "Arbitrum One": "ethereum",
-    "Optimism": "ethereum",
-    "Base": "ethereum",
-    "Fantom": "fantom",
-    "Gnosis": "xdai",
-    "Polygon": "polygon-ecosystem-token",
-    "Avalanche": "avalanche-2",
-    "BSC": "binancecoin",
-    "Linea": "ethereum",
-    "Shardeum Mainnet": "shardeum"
-}
+# Map networks to their native tokens' CoinGecko IDs
+TOKEN_MAP: Dict[str, str] = {network: info["coingecko_id"] for network, info in NETWORKS.items()}
+
+# Observed endpoint health: {"ewma_latency_ms", "success_ratio", "samples", "misses"}.
+# "misses" counts races lost since the endpoint last completed a request.
+EWMA_ALPHA = 0.2
+MIN_SAMPLES = 3  # completed requests needed before an endpoint's stats are trusted
+endpoint_stats: Dict[str, Dict[str, Optional[float]]] = {}
+
+def _get_endpoint_stats(endpoint: str) -> Dict[str, Optional[float]]:
+    return endpoint_stats.setdefault(
+        endpoint, {"ewma_latency_ms": None, "success_ratio": None, "samples": 0, "misses": 0}
+    )
+
+def record_endpoint_stats(endpoint: str, success: bool, latency_ms: Optional[float] = None) -> None:
+    """Fold one completed request into an endpoint's moving-average health stats."""
+    stats = _get_endpoint_stats(endpoint)
+    outcome = 1.0 if success else 0.0
+    if stats["success_ratio"] is None:
+        stats["success_ratio"] = outcome
+    else:
+        stats["success_ratio"] = (1 - EWMA_ALPHA) * stats["success_ratio"] + EWMA_ALPHA * outcome
+    if latency_ms is not None:
+        if stats["ewma_latency_ms"] is None:
+            stats["ewma_latency_ms"] = latency_ms
+        else:
+            stats["ewma_latency_ms"] = (1 - EWMA_ALPHA) * stats["ewma_latency_ms"] + EWMA_ALPHA * latency_ms
+    stats["samples"] += 1
+    stats["misses"] = 0
+
+def record_endpoint_miss(endpoint: str, elapsed_ms: float) -> None:
+    """Record that an endpoint was abandoned after `elapsed_ms` because another answered first.
+
+    The elapsed time is only a lower bound on the endpoint's latency, so it can
+    raise the latency average but never lower it, and it does not count as a
+    sample. Each miss also shrinks the endpoint's weight until it next completes
+    a request.
+    """
+    stats = _get_endpoint_stats(endpoint)
+    if stats["ewma_latency_ms"] is not None and elapsed_ms > stats["ewma_latency_ms"]:
+        stats["ewma_latency_ms"] = (1 - EWMA_ALPHA) * stats["ewma_latency_ms"] + EWMA_ALPHA * elapsed_ms
+    stats["misses"] += 1
+
+def get_endpoint_weights(endpoints: List[str]) -> Optional[List[float]]:
+    """Weight endpoints by success ratio over latency, divided by 1 + recent misses.
+
+    Endpoints with too few samples start from the average weight of the others.
+    Returns None if no endpoint has enough samples yet.
+    """
+    weights = []
+    for endpoint in endpoints:
+        stats = endpoint_stats.get(endpoint)
+        if stats is None or stats["samples"] < MIN_SAMPLES:
+            weights.append(None)
+        else:
+            # Endpoints that have only ever failed have no latency yet
+            latency_ms = stats["ewma_latency_ms"] or 0.0
+            weights.append(stats["success_ratio"] / (latency_ms + 1))
+    
+    known = [w for w in weights if w is not None]
+    if not known or not any(known):
+        return None
+    average = sum(known) / len(known)
+    return [
+        (average if w is None else w) / (1 + endpoint_stats.get(endpoint, {}).get("misses", 0))
+        for endpoint, w in zip(endpoints, weights)
+    ]
+
+def rank_endpoints(endpoints: List[str]) -> List[str]:
+    """Order endpoints by a weighted random draw favoring fast, reliable ones.
+
+    Keeps the configured order until some endpoint has enough samples.
+    """
+    weights = get_endpoint_weights(endpoints)
+    if weights is None:
+        return list(endpoints)
+    
+    remaining = list(zip(endpoints, weights))
+    ranked = []
+    while remaining:
+        if not any(w for _, w in remaining):
+            # Only endpoints that never succeed are left; keep their order
+            ranked.extend(ep for ep, _ in remaining)
+            break
+        index = random.choices(range(len(remaining)), weights=[w for _, w in remaining])[0]
+        ranked.append(remaining.pop(index)[0])
+    return ranked
 
 def get_random_endpoint(network: str) -> str:
-    """Get a random endpoint for a network, avoiding the last used one if possible."""
+    """Get a random endpoint for a network, avoiding the last used one if possible.
+
+    Endpoints are picked in proportion to their observed health once there are
+    enough samples, and uniformly before that.
+    """
     endpoints = RPC_ENDPOINTS[network]
     if len(endpoints) == 1:
         return endpoints[0]
@@ -165,7 +255,11 @@ def get_random_endpoint(network: str) -> str:
     if not available_endpoints:
         available_endpoints = endpoints
     
-    endpoint = random.choice(available_endpoints)
+    weights = get_endpoint_weights(available_endpoints)
+    if weights is None:
+        endpoint = random.choice(available_endpoints)
+    else:
+        endpoint = random.choices(available_endpoints, weights=weights)[0]
     last_used_endpoints[network] = endpoint
     return endpoint
 
@@ -176,11 +270,13 @@ def format_network_help() -> str:
         lines.append(f"  - {network:<20} ({info['native_token']}, {info['native_token_symbol']})")
     return "\n".join(lines)
 
+@lru_cache(maxsize=None)
 def get_network_info(network: str) -> NetworkInfo:
     """Get information about a network."""
     return NETWORKS.get(network, {
         "name": network,
         "native_token": "Unknown",
         "native_token_symbol": "???",
-        "coingecko_id": "unknown"
+        "coingecko_id": "unknown",
+        "block_time": 0.0
     }) 
\ No newline at end of file